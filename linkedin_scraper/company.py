@@ -184,7 +184,9 @@ class Company(Scraper):
     def scrape_logged_in(self, get_employees = True, close_on_complete = True):
         driver = self.driver
 
-        driver.get(self.linkedin_url)
+        # __init__ has usually just loaded the page; only navigate if it has not
+        if driver.current_url.rstrip("/") != self.linkedin_url.rstrip("/"):
+            driver.get(self.linkedin_url)
 
         _ = WebDriverWait(driver, 3).until(EC.presence_of_all_elements_located((By.XPATH, '//div[@dir="ltr"]')))
 
@@ -286,8 +288,6 @@ class Company(Scraper):
         if get_employees:
             self.employees = self.get_employees()
 
-        driver.get(self.linkedin_url)
-
         if close_on_complete:
             driver.close()
 
@@ -346,8 +346,6 @@ class Company(Scraper):
         if get_employees:
             self.employees = self.get_employees()
 
-        driver.get(self.linkedin_url)
-
         if close_on_complete:
             driver.close()
 
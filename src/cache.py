@@ -0,0 +1,59 @@
+import hashlib
+import time
+from typing import Dict, Any, Optional
+
+import orjson
+from apify import Actor
+
+from .results import Result, as_item
+
+
+class ResultCache:
+    """Cache of scraped results in a named Apify key-value store, shared across runs."""
+
+    def __init__(self, max_age_ms: int, force_fresh: bool = False, store_name: str = "linkedin-scraper-cache"):
+        self.max_age_ms = max_age_ms
+        self.force_fresh = force_fresh
+        self.store_name = store_name
+        self.hits = 0
+        self.misses = 0
+        self._store = None
+
+    async def open(self):
+        """Open the backing key-value store."""
+        self._store = await Actor.open_key_value_store(name=self.store_name)
+        Actor.log.info(f"Result cache enabled (store: {self.store_name}, max age: {self.max_age_ms} ms)")
+
+    @staticmethod
+    def make_key(scrape_type: str, url: str, options: Any) -> str:
+        """Build a store key from the scrape type, URL and scrape options."""
+        opts = orjson.dumps(options, default=str, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha1(f"{scrape_type}|{url}|".encode() + opts).hexdigest()
+
+    async def get(self, scrape_type: str, url: str, options: Any) -> Optional[Dict[str, Any]]:
+        """Return the cached result if it is younger than max age, otherwise None."""
+        if self._store is None or self.force_fresh:
+            return None
+
+        record = await self._store.get_value(self.make_key(scrape_type, url, options))
+        if not record or (time.time() - record["cached_at"]) * 1000 > self.max_age_ms:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        result = dict(record["result"])
+        result["from_cache"] = True
+        return result
+
+    async def set(self, scrape_type: str, url: str, options: Any, result: Result):
+        """Store a successful result; error results are never cached."""
+        if self._store is None:
+            return
+        item = as_item(result)
+        if "error" in item:
+            return
+
+        # Pass the record as a dict: local storage JSON-encodes values itself, so pre-encoded
+        # bytes or strings would come back from get_value as a string instead of a dict
+        record = {"cached_at": time.time(), "result": item}
+        await self._store.set_value(self.make_key(scrape_type, url, options), record)
@@ -0,0 +1,147 @@
+import calendar
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .results import EducationResult, ExperienceResult, PersonResult
+
+VOYAGER_PROFILE_URL = "https://www.linkedin.com/voyager/api/identity/profiles/{vanity}/profileView"
+
+# Statuses LinkedIn answers with when it rate-limits or challenges a session
+BLOCKED_STATUSES = (401, 403, 429, 999)
+
+
+class VoyagerError(Exception):
+    """Raised when the Voyager API can't serve a profile; the caller falls back to the browser."""
+
+    def __init__(self, message: str, blocked: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.blocked = blocked
+        self.retry_after = retry_after
+
+
+def format_date(date: Optional[Dict[str, int]]) -> Optional[str]:
+    """Format a Voyager {month, year} date the way the profile pages show it, e.g. "Jan 2020"."""
+    if not date or "year" not in date:
+        return None
+    if date.get("month"):
+        return f"{calendar.month_abbr[date['month']]} {date['year']}"
+    return str(date["year"])
+
+
+def urn_id(urn: Optional[str]) -> Optional[str]:
+    """Return the trailing id of a LinkedIn URN such as urn:li:fs_miniCompany:1234."""
+    return urn.rsplit(":", 1)[-1] if urn else None
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds; HTTP dates are ignored."""
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class HttpPersonScraper:
+    """Fetch person profiles from LinkedIn's Voyager API with the browser's session cookies.
+
+    This skips Chrome entirely for profiles, but only covers the fields the API returns
+    directly; contacts still need the browser.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, cookies: List[Dict[str, Any]], user_agent: str):
+        self.session = session
+        self.cookies = {cookie["name"]: cookie["value"] for cookie in cookies}
+        # Voyager rejects requests whose csrf-token header doesn't match the JSESSIONID cookie
+        csrf_token = self.cookies.get("JSESSIONID", "").strip('"')
+        self.headers = {
+            "csrf-token": csrf_token,
+            "accept": "application/json",
+            "x-restli-protocol-version": "2.0.0",
+            "x-li-lang": "en_US",
+            # Same browser identity the session logged in with, not aiohttp's default
+            "user-agent": user_agent,
+        }
+
+    @property
+    def available(self) -> bool:
+        """Whether the session has the cookies the API needs."""
+        return bool(self.cookies.get("li_at") and self.headers["csrf-token"])
+
+    @staticmethod
+    def vanity_name(url: str) -> Optional[str]:
+        """Extract the public profile id from a /in/<vanity> URL."""
+        parts = urlsplit(url).path.strip("/").split("/")
+        if len(parts) >= 2 and parts[0] == "in":
+            return parts[1]
+        return None
+
+    async def fetch_profile(self, url: str, proxy: Optional[str] = None) -> Dict[str, Any]:
+        """Return the raw profileView JSON for a profile URL, fetched through the given proxy."""
+        vanity = self.vanity_name(url)
+        if not vanity:
+            raise VoyagerError(f"Not a profile URL: {url}")
+
+        async with self.session.get(
+            VOYAGER_PROFILE_URL.format(vanity=vanity), headers=self.headers, cookies=self.cookies, proxy=proxy
+        ) as response:
+            if response.status in BLOCKED_STATUSES:
+                raise VoyagerError(
+                    f"Voyager API returned {response.status}",
+                    blocked=True,
+                    retry_after=retry_after_seconds(response.headers.get("Retry-After")),
+                )
+            if response.status != 200:
+                raise VoyagerError(f"Voyager API returned {response.status}")
+            return await response.json(content_type=None)
+
+    async def scrape_person(self, url: str, scraped_at: str, proxy: Optional[str] = None) -> PersonResult:
+        """Scrape a profile into the same result shape as the browser scraper."""
+        data = await self.fetch_profile(url, proxy)
+        profile = data.get("profile")
+        if not profile:
+            raise VoyagerError("Voyager response has no profile")
+
+        experiences = [
+            ExperienceResult(
+                position_title=position.get("title"),
+                company=position.get("companyName"),
+                location=position.get("locationName"),
+                from_date=format_date(position.get("timePeriod", {}).get("startDate")),
+                to_date=format_date(position.get("timePeriod", {}).get("endDate")) or "Present",
+                description=position.get("description"),
+                linkedin_url=(
+                    f"https://www.linkedin.com/company/{urn_id(position['companyUrn'])}/"
+                    if position.get("companyUrn") else None
+                ),
+            )
+            for position in data.get("positionView", {}).get("elements", [])
+        ]
+        educations = [
+            EducationResult(
+                institution=education.get("schoolName"),
+                degree=education.get("degreeName"),
+                from_date=format_date(education.get("timePeriod", {}).get("startDate")),
+                to_date=format_date(education.get("timePeriod", {}).get("endDate")),
+                description=education.get("description"),
+                linkedin_url=(
+                    f"https://www.linkedin.com/school/{urn_id(education['schoolUrn'])}/"
+                    if education.get("schoolUrn") else None
+                ),
+            )
+            for education in data.get("educationView", {}).get("elements", [])
+        ]
+        current = experiences[0] if experiences else ExperienceResult()
+
+        return PersonResult(
+            url=url,
+            name=f"{profile.get('firstName', '')} {profile.get('lastName', '')}".strip() or None,
+            location=profile.get("geoLocationName") or profile.get("locationName"),
+            about=profile.get("summary"),
+            company=current.company,
+            job_title=current.position_title,
+            experiences=experiences,
+            educations=educations,
+            scraped_at=scraped_at,
+        )
@@ -1,42 +1,242 @@
 import asyncio
-import json
+import functools
+import hashlib
+import logging
 import os
 import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
-from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from datetime import datetime, timezone
+from enum import IntEnum
 import traceback
 
+import aiohttp
+import orjson
 from apify import Actor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.client_config import ClientConfig
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    InvalidArgumentException,
+    InvalidSessionIdException,
+    NoSuchElementException,
+    TimeoutException,
+    WebDriverException,
+)
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
 
 # Import the LinkedIn scraper components
 from linkedin_scraper import Person, Company, Job, JobSearch, actions
 
+from .cache import ResultCache
+from .http_scraper import HttpPersonScraper, VoyagerError
+from .results import (
+    CompanyResult,
+    PersonResult,
+    Result,
+    as_item,
+    company_result,
+    job_listing_result,
+    person_result,
+)
+
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+)
+
+HEADLESS_FLAGS = (
+    '--headless',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+)
+
+CHROME_FLAGS = (
+    '--disable-blink-features=AutomationControlled',
+    '--disable-gpu',
+    '--disable-web-security',
+    '--disable-features=VizDisplayCompositor',
+    '--window-size=1920,1080',
+    '--start-maximized',
+)
+
+# Injected into every page to mask automation
+STEALTH_JS = '''
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    })
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    })
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en']
+    })
+    window.chrome = {
+        runtime: {}
+    }
+    Object.defineProperty(navigator, 'permissions', {
+        get: () => ({
+            query: () => Promise.resolve({ state: 'granted' })
+        })
+    })
+'''
+
+# Fields accepted by WebDriver add_cookie when restoring a saved session
+SESSION_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "expiry", "sameSite")
+
+SCRAPE_TYPES = ("person", "company", "job", "job_search")
+
+
+class Rotation(IntEnum):
+    """Proxy rotation strategies, named as in the proxyRotation input."""
+    PER_REQUEST = 0
+    UNTIL_FAILURE = 1
+    RECOMMENDED = 2
+
+
+# URL fragments of the pages LinkedIn redirects to when it throttles or challenges a session
+BLOCKED_PAGE_MARKERS = ("/checkpoint/", "/authwall", "/login", "/uas/login", "/error/")
+
+# Seconds before an HTTP fast path request is abandoned in favour of the browser
+HTTP_TIMEOUT = 30
+
+# Consecutive HTTP fast path failures after which the rest of the run uses the browser only
+MAX_HTTP_FAILURES = 3
+
+# Failures worth retrying; anything else fails immediately
+RETRYABLE_EXCEPTIONS = (TimeoutException, WebDriverException, ConnectionError, aiohttp.ClientError)
+# WebDriver errors that would fail the same way on the same driver
+PERMANENT_EXCEPTIONS = (NoSuchElementException, InvalidArgumentException, InvalidSessionIdException)
+
+# Results are pushed to the dataset in batches of this size, or after this many seconds
+PUSH_BATCH_SIZE = 25
+PUSH_INTERVAL = 5.0
+
+# Range of the random pause, in seconds, between URL batches when batchSize is set
+BATCH_PAUSE = (1.5, 4.0)
+
+# Progress is saved at most every this many seconds, or after this many updates
+PROGRESS_INTERVAL = 2.0
+PROGRESS_ITEMS = 10
+
+# Resources LinkedIn pages load that the scrapers never read. Stylesheets stay: WebElement.text
+# only returns rendered text, and without CSS the visually-hidden duplicate spans show up
+BLOCKED_URL_PATTERNS = (
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.ttf",
+    "*.mp4", "*.webm",
+    "*/ads/*", "*doubleclick*",
+)
+
+
+# Query parameters LinkedIn adds for click tracking; they never change the page content
+TRACKING_PARAMS = frozenset(("trk", "trkInfo", "trackingId", "refId", "lipi", "eBP", "originalSubdomain"))
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a LinkedIn URL, used to skip duplicate inputs."""
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query)
+        if key not in TRACKING_PARAMS and not key.startswith("utm_")
+    ]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), urlencode(query), ""))
+
+
+def dedupe_urls(urls: List[str]) -> List[str]:
+    """Normalize URLs and drop repeats, keeping the first occurrence's position."""
+    return list(dict.fromkeys(normalize_url(url) for url in urls if url))
+
+
+def utc_timestamp() -> str:
+    """Current UTC time as an ISO 8601 string, stamped on each result when it is scraped."""
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
 
 class LinkedInScraperActor:
     """Apify Actor for scraping LinkedIn profiles, companies, and jobs."""
     
-    def __init__(self):
+    # Fixed attribute set; every one is initialized in __init__
+    __slots__ = (
+        "driver", "driver_starts", "_rng", "current_delay", "min_delay", "max_delay",
+        "success_streak", "streak_to_speed_up", "max_retries", "retry_delay", "proxy_config", "_proxy_strategies",
+        "proxy_rotation", "session_pool_name", "_recommended_sessions", "_persistent_session",
+        "current_proxy_url", "proxy_failure_count", "max_proxy_failures", "concurrency", "headless",
+        "_credentials", "_executor", "_driver_pool", "_driver_slots", "result_cache", "block_resources",
+        "batch_size", "http_fast_path", "http_session", "http_scraper", "_http_failures", "last_user_agent", "_pending", "_last_flush",
+        "_progress", "_unsaved_progress", "_last_progress_write", "_session_store", "_session_cookies",
+        "_session_cookies_changed", "_service", "_service_lock",
+        "_owns_http_session",
+    )
+    
+    def __init__(self, http_session: Optional[aiohttp.ClientSession] = None):
         self.driver = None
-        self.scraped_at = datetime.now().isoformat()
-        self.request_count = 0
+        self.driver_starts = 0  # numbers proxy sessions so pooled drivers don't share one
+        self._rng = random.Random()  # private generator for user agent and proxy picks
+        self.current_delay = 1.0  # seconds, adapted by update_rate_limit
+        self.min_delay = 0.3
+        self.max_delay = 60.0
+        self.success_streak = 0
+        self.streak_to_speed_up = 20  # clean requests in a row before the delay shrinks
         self.max_retries = 3
-        self.retry_delay = 5  # seconds
+        self.retry_delay = 2  # seconds, initial backoff
         self.proxy_config = None
-        self.proxy_rotation = "RECOMMENDED"
+        self._proxy_strategies = {}  # Rotation -> proxy URL coroutine, picked in setup_proxy_configuration
+        self.proxy_rotation = Rotation.RECOMMENDED
         self.session_pool_name = None
+        self._recommended_sessions = ()  # proxy session ids RECOMMENDED rotates through
+        self._persistent_session = None
         self.current_proxy_url = None
         self.proxy_failure_count = 0
         self.max_proxy_failures = 5
+        self.concurrency = 4
+        self.headless = True
+        self._credentials = (None, None, None)
+        self._executor = None
+        self._driver_pool = None
+        self._driver_slots = 0
+        self.result_cache = None
+        self.block_resources = True
+        self.batch_size = 0  # URLs per batch, with a pause in between; 0 scrapes them all at once
+        self.http_fast_path = True
+        # A session passed in by the caller is reused and left open; otherwise run() creates and closes one
+        self.http_session = http_session
+        self._owns_http_session = http_session is None
+        self.http_scraper = None
+        self._http_failures = 0
+        self.last_user_agent = None  # user agent of the most recently started driver
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._progress = None
+        self._unsaved_progress = 0
+        self._last_progress_write = 0.0
+        self._session_store = None
+        self._session_cookies = None
+        self._session_cookies_changed = False
+        self._service = None  # one chromedriver shared by every Chrome in the pool
+        self._service_lock = threading.Lock()
     
     async def setup_proxy_configuration(self, proxy_config: Dict[str, Any]) -> Optional[Any]:
-        """Setup proxy configuration based on input."""
+        """Setup proxy configuration based on input and pick the URL strategies for its kind."""
         if not proxy_config:
             return None
+        
+        if self.session_pool_name:
+            self._recommended_sessions = tuple(f"{self.session_pool_name}_{i}" for i in range(10))
+            self._persistent_session = f"{self.session_pool_name}_persistent"
             
         try:
             # Check if using Apify proxy
@@ -47,11 +247,21 @@ class LinkedInScraperActor:
                     "country_code": proxy_config.get("apifyProxyCountry", "US")
                 }
                 
-                return Actor.create_proxy_configuration(**config_options)
+                self._proxy_strategies = {
+                    Rotation.PER_REQUEST: self.apify_per_request_url,
+                    Rotation.UNTIL_FAILURE: self.apify_until_failure_url,
+                    Rotation.RECOMMENDED: self.apify_recommended_url,
+                }
+                return await Actor.create_proxy_configuration(**config_options)
                 
             # Check for custom proxy URLs
             elif proxy_config.get("proxyUrls"):
                 # Return custom proxy configuration
+                self._proxy_strategies = {
+                    Rotation.PER_REQUEST: self.custom_per_request_url,
+                    Rotation.UNTIL_FAILURE: self.custom_until_failure_url,
+                    Rotation.RECOMMENDED: self.custom_recommended_url,
+                }
                 return {
                     "type": "custom",
                     "urls": proxy_config.get("proxyUrls")
@@ -65,143 +275,211 @@ class LinkedInScraperActor:
     
     async def get_proxy_url(self) -> Optional[str]:
         """Get a proxy URL based on rotation strategy."""
-        if not self.proxy_config:
+        if not self.proxy_config or not self._proxy_strategies:
             return None
             
         try:
-            # Handle Apify proxy
-            if hasattr(self.proxy_config, 'new_url'):
-                # Check rotation strategy
-                if self.proxy_rotation == "PER_REQUEST":
-                    # Always get a new proxy for each request
-                    if self.session_pool_name:
-                        session_id = f"{self.session_pool_name}_{self.request_count}"
-                        return await self.proxy_config.new_url(session_id)
-                    else:
-                        return await self.proxy_config.new_url()
-                        
-                elif self.proxy_rotation == "UNTIL_FAILURE":
-                    # Keep using the same proxy until it fails
-                    if not self.current_proxy_url or self.proxy_failure_count >= self.max_proxy_failures:
-                        self.proxy_failure_count = 0
-                        if self.session_pool_name:
-                            session_id = f"{self.session_pool_name}_persistent"
-                            self.current_proxy_url = await self.proxy_config.new_url(session_id)
-                        else:
-                            self.current_proxy_url = await self.proxy_config.new_url()
-                    return self.current_proxy_url
-                    
-                else:  # RECOMMENDED
-                    # Use session pool if available, otherwise rotate smartly
-                    if self.session_pool_name:
-                        session_id = f"{self.session_pool_name}_{self.request_count % 10}"
-                        return await self.proxy_config.new_url(session_id)
-                    else:
-                        return await self.proxy_config.new_url()
-                        
-            # Handle custom proxy
-            elif isinstance(self.proxy_config, dict) and self.proxy_config.get("type") == "custom":
-                urls = self.proxy_config.get("urls", [])
-                if urls:
-                    if self.proxy_rotation == "PER_REQUEST":
-                        return random.choice(urls)
-                    elif self.proxy_rotation == "UNTIL_FAILURE":
-                        if not self.current_proxy_url:
-                            self.current_proxy_url = random.choice(urls)
-                        return self.current_proxy_url
-                    else:  # RECOMMENDED
-                        # Round-robin through custom proxies
-                        index = self.request_count % len(urls)
-                        return urls[index]
-                        
+            return await self._proxy_strategies[self.proxy_rotation]()
         except Exception as e:
             Actor.log.error(f"Failed to get proxy URL: {e}")
             
         return None
+    
+    async def apify_per_request_url(self) -> str:
+        """A new Apify proxy session for every driver."""
+        if self.session_pool_name:
+            return await self.proxy_config.new_url(f"{self.session_pool_name}_{self.driver_starts}")
+        return await self.proxy_config.new_url()
+    
+    async def apify_until_failure_url(self) -> str:
+        """Keep using the same Apify proxy until it fails."""
+        if not self.current_proxy_url or self.proxy_failure_count >= self.max_proxy_failures:
+            self.proxy_failure_count = 0
+            if self._persistent_session:
+                self.current_proxy_url = await self.proxy_config.new_url(self._persistent_session)
+            else:
+                self.current_proxy_url = await self.proxy_config.new_url()
+        return self.current_proxy_url
+    
+    async def apify_recommended_url(self) -> str:
+        """Use the session pool if available, otherwise let Apify rotate."""
+        if self._recommended_sessions:
+            session_id = self._recommended_sessions[self.driver_starts % len(self._recommended_sessions)]
+            return await self.proxy_config.new_url(session_id)
+        return await self.proxy_config.new_url()
+    
+    async def custom_per_request_url(self) -> str:
+        """A random custom proxy for every driver."""
+        return self._rng.choice(self.proxy_config["urls"])
+    
+    async def custom_until_failure_url(self) -> str:
+        """Keep using one random custom proxy until it fails."""
+        if not self.current_proxy_url:
+            self.current_proxy_url = self._rng.choice(self.proxy_config["urls"])
+        return self.current_proxy_url
+    
+    async def custom_recommended_url(self) -> str:
+        """Round-robin through the custom proxies."""
+        urls = self.proxy_config["urls"]
+        return urls[self.driver_starts % len(urls)]
         
-    async def setup_driver(self, headless: bool = True) -> webdriver.Chrome:
-        """Set up Chrome driver with proxy if configured."""
+    def build_chrome_options(self, headless: bool, user_agent: str, proxy_url: Optional[str]) -> Options:
+        """Build Chrome options from the module-level flag lists."""
         chrome_options = Options()
         
         if headless:
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
+            for flag in HEADLESS_FLAGS:
+                chrome_options.add_argument(flag)
             
-        # Additional options to avoid detection
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        # Anti-detection and window options
+        for flag in CHROME_FLAGS:
+            chrome_options.add_argument(flag)
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options.add_argument(f"user-agent={user_agent}")
         
-        # Randomize user agent
-        user_agents = [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        ]
-        chrome_options.add_argument(f"user-agent={random.choice(user_agents)}")
-        
-        # Add more anti-detection options
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--disable-web-security')
-        chrome_options.add_argument('--disable-features=VizDisplayCompositor')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--start-maximized')
+        # Don't download images; the scrapers only read text and links
+        if self.block_resources:
+            chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        
+        if proxy_url:
+            chrome_options.add_argument(f'--proxy-server={proxy_url}')
         
+        return chrome_options
+    
+    async def setup_driver(self, headless: bool = True) -> webdriver.Remote:
+        """Set up Chrome driver with proxy if configured."""
         # Set up proxy if configured
+        self.driver_starts += 1
         proxy_url = await self.get_proxy_url()
         if proxy_url:
-            chrome_options.add_argument(f'--proxy-server={proxy_url}')
-            Actor.log.info(f"Using proxy: {proxy_url[:50]}...")  # Log partial URL for security
+            Actor.log.info("Using proxy: %s...", proxy_url[:50])  # Log partial URL for security
+        
+        # Randomize user agent
+        self.last_user_agent = self._rng.choice(USER_AGENTS)
+        chrome_options = self.build_chrome_options(headless, self.last_user_agent, proxy_url)
+        
+        # Chrome startup and every WebDriver command block on HTTP round-trips to
+        # chromedriver, so they run off the event loop to let other workers proceed
+        loop = asyncio.get_running_loop()
         
         # Use Apify's Chrome binary if available
         try:
-            driver = webdriver.Chrome(options=chrome_options)
+            driver = await loop.run_in_executor(None, self.create_chrome, chrome_options)
         except Exception as e:
             Actor.log.error(f"Failed to create Chrome driver: {e}")
             # If proxy failed, increment failure count
-            if proxy_url and self.proxy_rotation == "UNTIL_FAILURE":
+            if proxy_url and self.proxy_rotation is Rotation.UNTIL_FAILURE:
                 self.proxy_failure_count += 1
                 Actor.log.warning(f"Proxy failure count: {self.proxy_failure_count}/{self.max_proxy_failures}")
             raise
-            
-        # Execute script to mask automation
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-            'source': '''
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                })
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5]
-                })
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['en-US', 'en']
-                })
-                window.chrome = {
-                    runtime: {}
-                }
-                Object.defineProperty(navigator, 'permissions', {
-                    get: () => ({
-                        query: () => Promise.resolve({ state: 'granted' })
-                    })
-                })
-            '''
-        })
         
+        await loop.run_in_executor(None, self.prepare_session, driver)
         return driver
     
-    def login_to_linkedin(self, driver: webdriver.Chrome, email: str, password: str, cookie: Optional[str] = None) -> bool:
-        """Login to LinkedIn using credentials or cookie."""
+    def prepare_session(self, driver: webdriver.Remote):
+        """Send the per-session CDP setup (stealth script and resource blocking) in one executor hop."""
+        # Execute script to mask automation
+        self.execute_cdp(driver, 'Page.addScriptToEvaluateOnNewDocument', {'source': STEALTH_JS})
+        
+        # Drop media, fonts and ad trackers before any navigation
+        if self.block_resources:
+            self.execute_cdp(driver, 'Network.enable', {})
+            self.execute_cdp(driver, 'Network.setBlockedURLs', {'urls': list(BLOCKED_URL_PATTERNS)})
+    
+    def ensure_service(self) -> Service:
+        """Start the shared chromedriver on first use, or again if it died."""
+        with self._service_lock:
+            if self._service is None or not self._service.is_connectable():
+                service = Service(executable_path=os.getenv("CHROMEDRIVER", "chromedriver"))
+                service.start()
+                self._service = service
+            return self._service
+    
+    def stop_service(self):
+        """Stop the shared chromedriver, once all drivers have quit."""
+        with self._service_lock:
+            if self._service:
+                self._service.stop()
+                self._service = None
+    
+    def create_chrome(self, chrome_options: Options) -> webdriver.Remote:
+        """Open a Chrome session on the shared chromedriver."""
+        service = self.ensure_service()
+        client_config = ClientConfig(
+            remote_server_addr=service.service_url,
+            keep_alive=True,
+            init_args_for_pool_manager={"init_args_for_pool_manager": {"maxsize": self.concurrency}},
+        )
+        executor = ChromiumRemoteConnection(
+            remote_server_addr=service.service_url,
+            vendor_prefix="goog",
+            browser_name="chrome",
+            keep_alive=True,
+            client_config=client_config,
+        )
+        return webdriver.Remote(command_executor=executor, options=chrome_options)
+    
+    @staticmethod
+    def execute_cdp(driver: webdriver.Remote, cmd: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a Chrome DevTools Protocol command on a Remote Chrome session."""
+        return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params})["value"]
+    
+    def session_cookies_key(self) -> str:
+        """Key of the saved browser session, scoped to the account used to log in."""
+        email, _, cookie = self._credentials
+        account = hashlib.sha1((email or cookie or "").encode()).hexdigest()[:16]
+        return f"SESSION_COOKIES_{account}"
+    
+    async def load_session_cookies(self):
+        """Load the browser cookies saved by a previous run, if any."""
+        self._session_store = await Actor.open_key_value_store(name="linkedin-scraper-sessions")
+        self._session_cookies = await self._session_store.get_value(self.session_cookies_key())
+        if self._session_cookies:
+            Actor.log.info(f"Loaded {len(self._session_cookies)} saved session cookies")
+    
+    async def save_session_cookies(self):
+        """Persist the browser cookies of a fresh login for the next run."""
+        if self._session_store and self._session_cookies_changed:
+            await self._session_store.set_value(self.session_cookies_key(), self._session_cookies)
+            self._session_cookies_changed = False
+    
+    def restore_session(self, driver: webdriver.Remote) -> bool:
+        """Inject saved cookies into the driver and check they still authenticate."""
+        driver.get("https://www.linkedin.com")
+        for saved in self._session_cookies:
+            cookie = {k: v for k, v in saved.items() if k in SESSION_COOKIE_FIELDS}
+            try:
+                driver.add_cookie(cookie)
+            except Exception:
+                # Cookies of other LinkedIn subdomains can't be set from www
+                pass
+        
+        # An expired session redirects the feed to the login page
+        driver.get("https://www.linkedin.com/feed/")
+        return not any(marker in driver.current_url for marker in ("/login", "/authwall", "/checkpoint"))
+    
+    async def login_to_linkedin(self, driver: webdriver.Remote, email: str, password: str, cookie: Optional[str] = None) -> bool:
+        """Login to LinkedIn using a saved session, credentials or cookie."""
         try:
+            if self._session_cookies:
+                if await self.run_blocking(self.restore_session, driver):
+                    Actor.log.info("Reused saved LinkedIn session")
+                    return True
+                Actor.log.info("Saved LinkedIn session expired, logging in again...")
+            
             if cookie:
                 Actor.log.info("Logging in with cookie...")
-                actions.login(driver, cookie=cookie)
+                await self.run_blocking(actions.login, driver, cookie=cookie)
             else:
                 Actor.log.info("Logging in with email/password...")
-                actions.login(driver, email=email, password=password)
+                await self.run_blocking(actions.login, driver, email=email, password=password)
             
             # Add a small delay after login
-            time.sleep(2)
+            await asyncio.sleep(2)
+            
+            self._session_cookies = await self.run_blocking(driver.get_cookies)
+            self._session_cookies_changed = True
             
             Actor.log.info("Successfully logged into LinkedIn")
             return True
@@ -210,185 +488,140 @@ class LinkedInScraperActor:
             Actor.log.error(f"Failed to login to LinkedIn: {e}")
             return False
     
-    def add_rate_limit_delay(self, min_delay: float = 2.0, max_delay: float = 5.0):
-        """Add random delay for rate limiting."""
-        delay = random.uniform(min_delay, max_delay)
-        Actor.log.debug(f"Rate limiting: waiting {delay:.2f} seconds")
-        time.sleep(delay)
-        self.request_count += 1
-        
-        # Add longer delay every 10 requests
-        if self.request_count % 10 == 0:
-            long_delay = random.uniform(10, 20)
-            Actor.log.info(f"Taking a longer break: {long_delay:.2f} seconds")
-            time.sleep(long_delay)
-    
-    def retry_on_failure(self, func, *args, **kwargs):
-        """Retry a function on failure with exponential backoff."""
-        for attempt in range(self.max_retries):
-            try:
-                return func(*args, **kwargs)
-            except Exception as e:
-                if attempt == self.max_retries - 1:
-                    Actor.log.error(f"Failed after {self.max_retries} attempts: {e}")
-                    raise
-                
-                wait_time = self.retry_delay * (2 ** attempt)
-                Actor.log.warning(f"Attempt {attempt + 1} failed, retrying in {wait_time} seconds: {e}")
-                time.sleep(wait_time)
+    async def add_rate_limit_delay(self):
+        """Wait the current adaptive delay for rate limiting, jittered so workers don't fire in lockstep."""
+        delay = self._rng.uniform(self.current_delay, self.current_delay * 1.5)
+        Actor.log.debug("Rate limiting: waiting %.2f seconds", delay)
+        await asyncio.sleep(delay)
     
-    def scrape_person(self, url: str, get_contacts: bool = False) -> Dict[str, Any]:
+    def update_rate_limit(self, blocked: bool):
+        """Adapt the delay to LinkedIn's response (AIMD)."""
+        if blocked:
+            self.success_streak = 0
+            self.current_delay = min(self.max_delay, self.current_delay * 2)
+            Actor.log.warning("LinkedIn is throttling requests, increasing delay to %.2f seconds", self.current_delay)
+        else:
+            self.success_streak += 1
+            if self.success_streak >= self.streak_to_speed_up:
+                self.success_streak = 0
+                self.current_delay = max(self.min_delay, self.current_delay * 0.9)
+    
+    @staticmethod
+    def is_blocked(driver: webdriver.Remote) -> bool:
+        """Check whether LinkedIn answered with a login wall, challenge or rate-limit page."""
+        return any(marker in driver.current_url for marker in BLOCKED_PAGE_MARKERS)
+    
+    async def scrape_with_retry(self, url: str, scrape_fn, *args) -> Result:
+        """Run a scrape of url, retrying transient failures with full-jitter exponential backoff."""
+        def log_retry(retry_state):
+            Actor.log.warning(
+                "Attempt %d/%d for %s failed with %s, retrying in %.1f seconds", retry_state.attempt_number,
+                self.max_retries, url, type(retry_state.outcome.exception()).__name__, retry_state.next_action.sleep
+            )
+        
+        async for attempt in AsyncRetrying(
+            retry=retry_if_exception_type(RETRYABLE_EXCEPTIONS) & retry_if_not_exception_type(PERMANENT_EXCEPTIONS),
+            wait=wait_random_exponential(multiplier=self.retry_delay, max=60),
+            stop=stop_after_attempt(self.max_retries),
+            before_sleep=log_retry,
+            reraise=True,
+        ):
+            with attempt:
+                return await scrape_fn(*args)
+    
+    async def run_blocking(self, func, *args, **kwargs):
+        """Run a blocking Selenium call on the scraper thread pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+    
+    async def scrape_person(self, driver: webdriver.Remote, url: str, get_contacts: bool = False) -> PersonResult:
         """Scrape a LinkedIn person profile."""
+        Actor.log.info("Scraping person profile: %s", url)
+        
+        # Add rate limiting
+        await self.add_rate_limit_delay()
+        
+        person = await self.run_blocking(
+            Person,
+            linkedin_url=url,
+            driver=driver,
+            scrape=True,
+            close_on_complete=False
+        )
+        
+        result = person_result(person, url, get_contacts, utc_timestamp())
+        
+        Actor.log.info("Successfully scraped person: %s", person.name)
+        return result
+    
+    async def scrape_person_http(self, url: str) -> Optional[PersonResult]:
+        """Scrape a person profile through the Voyager API, returning None to fall back to the browser."""
+        if self._http_failures >= MAX_HTTP_FAILURES:
+            return None
+        
+        await self.add_rate_limit_delay()
         try:
-            Actor.log.info(f"Scraping person profile: {url}")
-            
-            # Add rate limiting
-            self.add_rate_limit_delay()
-            
-            person = Person(
-                linkedin_url=url,
-                driver=self.driver,
-                scrape=True,
-                close_on_complete=False
-            )
-            
-            result = {
-                "type": "person",
-                "url": url,
-                "name": person.name,
-                "location": getattr(person, 'location', None),
-                "about": person.about,
-                "open_to_work": getattr(person, 'open_to_work', False),
-                "company": person.company,
-                "job_title": person.job_title,
-                "experiences": [],
-                "educations": [],
-                "interests": [],
-                "accomplishments": [],
-                "scraped_at": self.scraped_at
-            }
-            
-            # Convert experiences to dict
-            for exp in person.experiences:
-                result["experiences"].append({
-                    "position_title": exp.position_title,
-                    "company": exp.institution_name,
-                    "location": exp.location,
-                    "from_date": exp.from_date,
-                    "to_date": exp.to_date,
-                    "duration": exp.duration,
-                    "description": exp.description,
-                    "linkedin_url": exp.linkedin_url
-                })
-            
-            # Convert educations to dict
-            for edu in person.educations:
-                result["educations"].append({
-                    "institution": edu.institution_name,
-                    "degree": edu.degree,
-                    "from_date": edu.from_date,
-                    "to_date": edu.to_date,
-                    "description": edu.description,
-                    "linkedin_url": edu.linkedin_url
-                })
-            
-            # Add contacts if requested
-            if get_contacts and person.contacts:
-                result["contacts"] = []
-                for contact in person.contacts:
-                    result["contacts"].append({
-                        "name": contact.name,
-                        "occupation": contact.occupation,
-                        "url": contact.url
-                    })
-            
-            Actor.log.info(f"Successfully scraped person: {person.name}")
-            return result
-            
-        except Exception as e:
-            Actor.log.error(f"Error scraping person {url}: {e}")
-            return {"error": str(e), "url": url, "type": "person"}
+            # Same proxy and rotation as the browser, so the session cookie never leaves from the actor host
+            result = await self.http_scraper.scrape_person(url, utc_timestamp(), await self.get_proxy_url())
+        except (VoyagerError, aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self._http_failures += 1
+            if getattr(e, "blocked", False):
+                self.update_rate_limit(True)
+            # LinkedIn's Retry-After is a floor for the shared delay, not just for this request
+            if getattr(e, "retry_after", None):
+                self.current_delay = min(self.max_delay, max(self.current_delay, e.retry_after))
+            Actor.log.info("HTTP fast path failed for %s (%s), using the browser", url, e)
+            if self._http_failures == MAX_HTTP_FAILURES:
+                Actor.log.warning("HTTP fast path keeps failing, using the browser for the rest of the run")
+            return None
+        
+        self._http_failures = 0
+        self.update_rate_limit(False)
+        Actor.log.info("Successfully scraped person over HTTP: %s", result.name)
+        return result
     
-    def scrape_company(self, url: str, get_employees: bool = False) -> Dict[str, Any]:
+    async def scrape_company(self, driver: webdriver.Remote, url: str, get_employees: bool = False) -> CompanyResult:
         """Scrape a LinkedIn company profile."""
-        try:
-            Actor.log.info(f"Scraping company profile: {url}")
-            
-            # Add rate limiting
-            self.add_rate_limit_delay()
-            
-            company = Company(
-                linkedin_url=url,
-                driver=self.driver,
-                scrape=True,
-                get_employees=get_employees,
-                close_on_complete=False
-            )
-            
-            result = {
-                "type": "company",
-                "url": url,
-                "name": company.name,
-                "about": company.about_us,
-                "website": company.website,
-                "phone": company.phone,
-                "headquarters": company.headquarters,
-                "founded": company.founded,
-                "industry": company.industry,
-                "company_type": company.company_type,
-                "company_size": company.company_size,
-                "specialties": company.specialties,
-                "headcount": company.headcount,
-                "scraped_at": self.scraped_at
-            }
-            
-            # Add showcase pages
-            if company.showcase_pages:
-                result["showcase_pages"] = [
-                    {
-                        "name": page.name,
-                        "url": page.linkedin_url,
-                        "followers": page.followers
-                    }
-                    for page in company.showcase_pages
-                ]
-            
-            # Add employees if requested
-            if get_employees and company.employees:
-                result["employees"] = company.employees
-            
-            Actor.log.info(f"Successfully scraped company: {company.name}")
-            return result
-            
-        except Exception as e:
-            Actor.log.error(f"Error scraping company {url}: {e}")
-            return {"error": str(e), "url": url, "type": "company"}
+        Actor.log.info("Scraping company profile: %s", url)
+        
+        # Add rate limiting
+        await self.add_rate_limit_delay()
+        
+        company = await self.run_blocking(
+            Company,
+            linkedin_url=url,
+            driver=driver,
+            scrape=True,
+            get_employees=get_employees,
+            close_on_complete=False
+        )
+        
+        result = company_result(company, url, get_employees, utc_timestamp())
+        
+        Actor.log.info("Successfully scraped company: %s", company.name)
+        return result
     
-    def scrape_job(self, url: str) -> Dict[str, Any]:
+    async def scrape_job(self, driver: webdriver.Remote, url: str) -> Dict[str, Any]:
         """Scrape a LinkedIn job posting."""
-        try:
-            Actor.log.info(f"Scraping job posting: {url}")
-            
-            # Add rate limiting
-            self.add_rate_limit_delay()
-            
-            job = Job(
-                linkedin_url=url,
-                driver=self.driver,
-                scrape=True,
-                close_on_complete=False
-            )
-            
-            result = job.to_dict()
-            result["type"] = "job"
-            result["scraped_at"] = self.scraped_at
-            
-            Actor.log.info(f"Successfully scraped job: {job.job_title}")
-            return result
-            
-        except Exception as e:
-            Actor.log.error(f"Error scraping job {url}: {e}")
-            return {"error": str(e), "url": url, "type": "job"}
+        Actor.log.info("Scraping job posting: %s", url)
+        
+        # Add rate limiting
+        await self.add_rate_limit_delay()
+        
+        job = await self.run_blocking(
+            Job,
+            linkedin_url=url,
+            driver=driver,
+            scrape=True,
+            close_on_complete=False
+        )
+        
+        result = job.to_dict()
+        result["type"] = "job"
+        result["scraped_at"] = utc_timestamp()
+        
+        Actor.log.info("Successfully scraped job: %s", job.job_title)
+        return result
     
     def search_jobs(self, search_term: str, scrape_recommended: bool = True) -> List[Dict[str, Any]]:
         """Search for jobs on LinkedIn."""
@@ -401,33 +634,18 @@ class LinkedInScraperActor:
                 close_on_complete=False
             )
             
-            results = []
-            
-            # Get search results
-            if search_term:
-                job_listings = job_search.search(search_term)
-                for job in job_listings:
-                    results.append({
-                        "type": "job_search_result",
-                        "job_title": job.job_title,
-                        "company": job.company,
-                        "location": job.location,
-                        "url": job.linkedin_url,
-                        "scraped_at": self.scraped_at
-                    })
-            
-            # Add recommended jobs if requested
+            scraped_at = utc_timestamp()
+            
+            # Search results, then recommended jobs if requested
+            results = [
+                job_listing_result(job, "job_search_result", scraped_at)
+                for job in (job_search.search(search_term) if search_term else ())
+            ]
             if scrape_recommended:
-                if hasattr(job_search, 'recommended_jobs'):
-                    for job in job_search.recommended_jobs:
-                        results.append({
-                            "type": "recommended_job",
-                            "job_title": job.job_title,
-                            "company": job.company,
-                            "location": job.location,
-                            "url": job.linkedin_url,
-                            "scraped_at": self.scraped_at
-                        })
+                results.extend(
+                    job_listing_result(job, "recommended_job", scraped_at)
+                    for job in getattr(job_search, "recommended_jobs", ())
+                )
             
             Actor.log.info(f"Found {len(results)} jobs")
             return results
@@ -436,21 +654,245 @@ class LinkedInScraperActor:
             Actor.log.error(f"Error searching jobs: {e}")
             return [{"error": str(e), "search_term": search_term, "type": "job_search"}]
     
-    async def run(self, actor_input: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Main run method for the actor."""
-        results = []
+    async def push_result(self, result: Result):
+        """Buffer a result as a dataset item and push the buffer once it is large or old enough."""
+        self._pending.append(as_item(result))
+        if len(self._pending) >= PUSH_BATCH_SIZE or time.monotonic() - self._last_flush >= PUSH_INTERVAL:
+            await self.flush_results()
+    
+    async def flush_results(self):
+        """Push all buffered results in one call."""
+        if self._pending:
+            # Swap the buffer first so results added by other workers meanwhile aren't pushed twice
+            batch, self._pending = self._pending, []
+            await Actor.push_data(batch)
+        self._last_flush = time.monotonic()
+    
+    async def save_progress(self, progress: Dict[str, Any], force: bool = False):
+        """Save progress, debounced to once every few seconds or items unless forced."""
+        self._progress = progress
+        self._unsaved_progress += 1
+        now = time.monotonic()
+        if force or self._unsaved_progress >= PROGRESS_ITEMS or now - self._last_progress_write >= PROGRESS_INTERVAL:
+            self._unsaved_progress = 0
+            self._last_progress_write = now
+            await Actor.set_value("PROGRESS", progress)
+    
+    def create_http_session(self) -> aiohttp.ClientSession:
+        """Create the one HTTP session of the run, keeping connections to LinkedIn alive between requests."""
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency * 2,
+            limit_per_host=self.concurrency * 2,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True,
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT))
+    
+    async def start_driver(self) -> Optional[webdriver.Remote]:
+        """Create a new driver and log it into LinkedIn, returning None if login fails."""
+        email, password, cookie = self._credentials
+        driver = await self.setup_driver(headless=self.headless)
+        if not await self.login_to_linkedin(driver, email, password, cookie):
+            await self.quit_driver(driver)
+            return None
+        return driver
+    
+    async def quit_driver(self, driver: Optional[webdriver.Remote]):
+        """Quit a driver off the event loop, ignoring errors from an already dead browser."""
+        if driver:
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, driver.quit)
+            except:
+                pass
+    
+    async def scrape_urls(self, urls: List[str], scrape_type: str, scrape_fn, scrape_args: tuple,
+                          driver: webdriver.Remote, progress: Dict[str, Any], http_fn=None):
+        """Scrape URLs concurrently, each task checking a logged-in Chrome driver out of a shared pool."""
+        concurrency = min(self.concurrency, len(urls)) or 1
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="scraper")
+        self._driver_pool = asyncio.Queue()
+        self._driver_pool.put_nowait(driver)
+        self._driver_slots = concurrency
+        semaphore = asyncio.Semaphore(concurrency)
+        total = len(urls)
+        
+        try:
+            if http_fn:
+                for _ in range(concurrency - 1):
+                    self._driver_pool.put_nowait(None)
+            else:
+                await self.prewarm_drivers(concurrency - 1)
+            Actor.log.info(f"Scraping {total} {scrape_type} URLs with {self._driver_slots} drivers")
+            batch_size = self.batch_size or total
+            for start in range(0, total, batch_size):
+                if start:
+                    pause = self._rng.uniform(*BATCH_PAUSE)
+                    Actor.log.info("Pausing %.1f seconds before the next batch", pause)
+                    await asyncio.sleep(pause)
+                await asyncio.gather(*(
+                    self.scrape_url(semaphore, i, total, url, scrape_type, scrape_fn, scrape_args, progress, http_fn)
+                    for i, url in enumerate(urls[start:start + batch_size], start)
+                ))
+        finally:
+            while not self._driver_pool.empty():
+                await self.quit_driver(self._driver_pool.get_nowait())
+            self._driver_pool = None
+    
+    async def prewarm_drivers(self, count: int):
+        """Start and log in extra drivers concurrently, dropping the slots of those that fail."""
+        started = await asyncio.gather(*(self.start_driver() for _ in range(count)), return_exceptions=True)
+        for driver in started:
+            if isinstance(driver, webdriver.Remote):
+                self._driver_pool.put_nowait(driver)
+            else:
+                self._driver_slots -= 1
+                if isinstance(driver, Exception):
+                    Actor.log.error(f"Error starting driver: {driver}")
+        if self._driver_slots < count + 1:
+            Actor.log.warning(f"Only {self._driver_slots} of {count + 1} drivers logged in")
+    
+    async def acquire_driver(self) -> Optional[webdriver.Remote]:
+        """Check a driver out of the pool, logging one in if the slot is empty."""
+        while True:
+            driver = await self._driver_pool.get()
+            if driver is None:
+                try:
+                    driver = await self.start_driver()
+                except Exception as e:
+                    Actor.log.error(f"Error starting driver: {e}")
+            if driver is not None:
+                return driver
+            if self._driver_slots == 1:
+                self._driver_pool.put_nowait(None)
+                return None
+            self._driver_slots -= 1
+            Actor.log.error(f"Failed to start a driver, continuing with {self._driver_slots}")
+    
+    async def discard_driver(self, driver: webdriver.Remote):
+        """Quit a checked-out driver and free its slot, so the next task logs in a fresh one."""
+        await self.quit_driver(driver)
+        self._driver_pool.put_nowait(None)
+    
+    async def scrape_url(self, semaphore: asyncio.Semaphore, i: int, total: int, url: str, scrape_type: str,
+                         scrape_fn, scrape_args: tuple, progress: Dict[str, Any], http_fn=None):
+        """Scrape one URL, or take it from the cache, and record the result or the error."""
+        async with semaphore:
+            Actor.log.info("Processing %s %d/%d: %s", scrape_type, i + 1, total, url)
+            try:
+                result = None
+                if self.result_cache:
+                    result = await self.result_cache.get(scrape_type, url, scrape_args)
+                
+                if result is None and http_fn:
+                    result = await http_fn(url)
+                    if result is not None and self.result_cache:
+                        await self.result_cache.set(scrape_type, url, scrape_args, result)
+                
+                if result is None:
+                    result = await self.scrape_with_driver(scrape_fn, url, scrape_args)
+                    if self.result_cache:
+                        await self.result_cache.set(scrape_type, url, scrape_args, result)
+                
+                progress["completed"] += 1
+                await self.push_result(result)
+                await self.save_progress(progress)
+                
+            except Exception as e:
+                Actor.log.error(f"Failed to scrape {url}: {e}")
+                progress["failed"] += 1
+                error = {"error": str(e), "url": url, "type": scrape_type}
+                await self.push_result(error)
+                await self.save_progress(progress)
+    
+    async def scrape_with_driver(self, scrape_fn, url: str, scrape_args: tuple) -> Result:
+        """Scrape a URL on a pooled driver."""
+        driver = await self.acquire_driver()
+        if driver is None:
+            raise RuntimeError("No logged-in driver available")
+        
+        try:
+            # PER_REQUEST cycles URLs over the pooled drivers, each on its own proxy
+            # session, and varies the browser fingerprint per request
+            if self.proxy_rotation is Rotation.PER_REQUEST:
+                await self.run_blocking(self.execute_cdp, driver, 'Network.setUserAgentOverride', {
+                    'userAgent': self._rng.choice(USER_AGENTS)
+                })
+            
+            result = await self.scrape_with_retry(
+                url, self.scrape_and_check_block, scrape_fn, driver, url, *scrape_args
+            )
+            self.update_rate_limit(await self.run_blocking(self.is_blocked, driver))
+            return result
+        
+        except Exception:
+            # If using UNTIL_FAILURE, check if we need to rotate proxy
+            if self.proxy_rotation is Rotation.UNTIL_FAILURE:
+                self.proxy_failure_count += 1
+                if self.proxy_failure_count >= self.max_proxy_failures:
+                    Actor.log.info("Max proxy failures reached, rotating proxy...")
+                    self.current_proxy_url = None
+                    await self.discard_driver(driver)
+                    driver = None
+            
+            # For PER_REQUEST, only the failing driver is replaced with a new proxy session
+            elif self.proxy_rotation is Rotation.PER_REQUEST:
+                await self.discard_driver(driver)
+                driver = None
+            raise
         
+        finally:
+            if driver is not None:
+                self._driver_pool.put_nowait(driver)
+    
+    async def scrape_and_check_block(self, scrape_fn, driver: webdriver.Remote, url: str, *scrape_args) -> Result:
+        """Run one scrape attempt, backing off if it failed on a block or challenge page."""
+        try:
+            return await scrape_fn(driver, url, *scrape_args)
+        except Exception:
+            try:
+                blocked = await self.run_blocking(self.is_blocked, driver)
+            except WebDriverException:
+                blocked = False  # the browser is gone; the original error says why
+            if blocked:
+                self.update_rate_limit(True)
+            raise
+    
+    @staticmethod
+    def validate_inputs(scrape_type: str, urls: List[str], job_search_term: Optional[str], email: Optional[str],
+                        password: Optional[str], cookie: Optional[str], proxy_rotation: str) -> Optional[str]:
+        """Return why the input can't be scraped, or None if it is usable."""
+        if not cookie and not (email and password):
+            return "Either cookie or email/password must be provided for authentication"
+        if scrape_type not in SCRAPE_TYPES:
+            return f"Unknown scrape type: {scrape_type}"
+        if proxy_rotation not in Rotation.__members__:
+            return f"Unknown proxy rotation: {proxy_rotation}"
+        if scrape_type == "job_search":
+            if not job_search_term:
+                return "jobSearchTerm is required for job_search"
+        elif not urls:
+            return f"At least one URL is required for {scrape_type} scraping"
+        return None
+    
+    def summary(self) -> Dict[str, int]:
+        """Counts of scraped and failed URLs so far."""
+        progress = self._progress or {}
+        return {"completed": progress.get("completed", 0), "failed": progress.get("failed", 0)}
+    
+    async def run(self, actor_input: Dict[str, Any]) -> Dict[str, int]:
+        """Main run method for the actor."""
         try:
             # Extract input parameters
             scrape_type = actor_input.get("scrapeType", "person")
-            urls = actor_input.get("urls", [])
+            urls = dedupe_urls(actor_input.get("urls", []))
             email = actor_input.get("email")
             password = actor_input.get("password")
             cookie = actor_input.get("cookie")
             
             # Proxy configuration
             proxy_configuration = actor_input.get("proxyConfiguration", {"useApifyProxy": True})
-            self.proxy_rotation = actor_input.get("proxyRotation", "RECOMMENDED")
+            proxy_rotation = actor_input.get("proxyRotation", "RECOMMENDED")
             self.session_pool_name = actor_input.get("sessionPoolName")
             
             headless = actor_input.get("headless", True)
@@ -458,25 +900,53 @@ class LinkedInScraperActor:
             get_employees = actor_input.get("getEmployees", False)
             job_search_term = actor_input.get("jobSearchTerm")
             max_results = actor_input.get("maxResults", 100)
+            urls = urls[:max_results]
+            self.concurrency = max(1, actor_input.get("concurrency", 4))
+            self.batch_size = max(0, actor_input.get("batchSize", 0))
+            self.headless = headless
+            self._credentials = (email, password, cookie)
+            self.block_resources = actor_input.get("blockResources", True)
+            self.http_fast_path = actor_input.get("httpFastPath", True)
+            max_age = actor_input.get("maxAge", 0)
+            force_fresh = actor_input.get("forceFresh", False)
             
-            # Validate input
-            if not cookie and not (email and password):
-                Actor.log.error("Either cookie or email/password must be provided for authentication")
-                await Actor.set_value("ERROR", {"error": "Authentication credentials missing"})
-                return results
+            # Validate input before paying for a Chrome start and login
+            error = self.validate_inputs(scrape_type, urls, job_search_term, email, password, cookie, proxy_rotation)
+            if error:
+                Actor.log.error(error)
+                await Actor.set_value("ERROR", {"error": error})
+                return self.summary()
+            self.proxy_rotation = Rotation[proxy_rotation]
+            
+            # Setup result cache
+            if max_age > 0:
+                self.result_cache = ResultCache(max_age, force_fresh=force_fresh)
+                await self.result_cache.open()
             
             # Setup proxy configuration
             Actor.log.info("Setting up proxy configuration...")
             self.proxy_config = await self.setup_proxy_configuration(proxy_configuration)
             
-            # Setup driver
+            # Setup driver and login to LinkedIn, reusing the previous run's session when possible
+            await self.load_session_cookies()
             Actor.log.info("Setting up Chrome driver...")
-            self.driver = await self.setup_driver(headless=headless)
-            
-            # Login to LinkedIn
-            if not self.login_to_linkedin(self.driver, email, password, cookie):
+            self.driver = await self.start_driver()
+            if self.driver is None:
                 await Actor.set_value("ERROR", {"error": "Login failed"})
-                return results
+                return self.summary()
+            await self.save_session_cookies()
+            
+            # Profiles can be read from the Voyager API with the session cookies; contacts need the browser
+            if self.http_fast_path and scrape_type == "person" and not get_contacts:
+                if self.http_session is None:
+                    self.http_session = self.create_http_session()
+                # Send the user agent of the driver that logged in
+                self.http_scraper = HttpPersonScraper(
+                    self.http_session, self._session_cookies or [], self.last_user_agent
+                )
+                if not self.http_scraper.available:
+                    Actor.log.info("Session has no Voyager API cookies, using the browser only")
+                    self.http_scraper = None
             
             # Save session info if using session pool
             if self.session_pool_name:
@@ -489,120 +959,43 @@ class LinkedInScraperActor:
             
             # Save progress periodically
             progress = {
-                "total": min(len(urls), max_results) if urls else max_results,
+                "total": len(urls) if urls else max_results,
                 "completed": 0,
                 "failed": 0,
                 "scrape_type": scrape_type,
-                "proxy_rotation": self.proxy_rotation,
+                "proxy_rotation": self.proxy_rotation.name,
                 "session_pool": self.session_pool_name
             }
-            await Actor.set_value("PROGRESS", progress)
+            await self.save_progress(progress, force=True)
+            
+            # A job search pushes the listings it finds; the other types scrape their URLs
+            if scrape_type == "job_search":
+                listings = await self.run_blocking(self.search_jobs, job_search_term, scrape_recommended=True)
+                listings = listings[:max_results]
+                progress["total"] = len(listings)
+                for listing in listings:
+                    progress["failed" if "error" in listing else "completed"] += 1
+                    await self.push_result(listing)
+                await self.save_progress(progress)
+            else:
+                # Scrape function and extra arguments for each scrape type
+                scrapers = {
+                    "person": (self.scrape_person, (get_contacts,)),
+                    "company": (self.scrape_company, (get_employees,)),
+                    "job": (self.scrape_job, ()),
+                }
+                scrape_fn, scrape_args = scrapers[scrape_type]
+                
+                # The first worker takes over the driver we already logged in with
+                driver, self.driver = self.driver, None
+                http_fn = self.scrape_person_http if self.http_scraper else None
+                await self.scrape_urls(urls, scrape_type, scrape_fn, scrape_args, driver, progress, http_fn)
             
-            # Process based on scrape type
-            if scrape_type == "person":
-                for i, url in enumerate(urls[:max_results]):
-                    Actor.log.info(f"Processing person {i+1}/{min(len(urls), max_results)}: {url}")
-                    try:
-                        # For PER_REQUEST rotation, recreate driver
-                        if self.proxy_rotation == "PER_REQUEST" and i > 0:
-                            self.driver.quit()
-                            self.driver = await self.setup_driver(headless=headless)
-                            # Re-login if needed
-                            if not self.login_to_linkedin(self.driver, email, password, cookie):
-                                Actor.log.error(f"Failed to re-login for URL {url}")
-                                progress["failed"] += 1
-                                continue
-                        
-                        result = self.retry_on_failure(self.scrape_person, url, get_contacts)
-                        results.append(result)
-                        await Actor.push_data(result)
-                        progress["completed"] += 1
-                        
-                    except Exception as e:
-                        Actor.log.error(f"Failed to scrape {url}: {e}")
-                        progress["failed"] += 1
-                        results.append({"error": str(e), "url": url, "type": "person"})
-                        
-                        # If using UNTIL_FAILURE, check if we need to rotate proxy
-                        if self.proxy_rotation == "UNTIL_FAILURE":
-                            self.proxy_failure_count += 1
-                            if self.proxy_failure_count >= self.max_proxy_failures:
-                                Actor.log.info("Max proxy failures reached, rotating proxy...")
-                                self.current_proxy_url = None
-                                self.driver.quit()
-                                self.driver = await self.setup_driver(headless=headless)
-                                if not self.login_to_linkedin(self.driver, email, password, cookie):
-                                    Actor.log.error("Failed to re-login after proxy rotation")
-                                    break
-                    
-                    # Update progress
-                    await Actor.set_value("PROGRESS", progress)
-                    
-            elif scrape_type == "company":
-                for i, url in enumerate(urls[:max_results]):
-                    Actor.log.info(f"Processing company {i+1}/{min(len(urls), max_results)}: {url}")
-                    try:
-                        # For PER_REQUEST rotation, recreate driver
-                        if self.proxy_rotation == "PER_REQUEST" and i > 0:
-                            self.driver.quit()
-                            self.driver = await self.setup_driver(headless=headless)
-                            if not self.login_to_linkedin(self.driver, email, password, cookie):
-                                Actor.log.error(f"Failed to re-login for URL {url}")
-                                progress["failed"] += 1
-                                continue
-                        
-                        result = self.retry_on_failure(self.scrape_company, url, get_employees)
-                        results.append(result)
-                        await Actor.push_data(result)
-                        progress["completed"] += 1
-                        
-                    except Exception as e:
-                        Actor.log.error(f"Failed to scrape {url}: {e}")
-                        progress["failed"] += 1
-                        results.append({"error": str(e), "url": url, "type": "company"})
-                    
-                    # Update progress
-                    await Actor.set_value("PROGRESS", progress)
-                    
-            elif scrape_type == "job":
-                for i, url in enumerate(urls[:max_results]):
-                    Actor.log.info(f"Processing job {i+1}/{min(len(urls), max_results)}: {url}")
-                    try:
-                        # For PER_REQUEST rotation, recreate driver
-                        if self.proxy_rotation == "PER_REQUEST" and i > 0:
-                            self.driver.quit()
-                            self.driver = await self.setup_driver(headless=headless)
-                            if not self.login_to_linkedin(self.driver, email, password, cookie):
-                                Actor.log.error(f"Failed to re-login for URL {url}")
-                                progress["failed"] += 1
-                                continue
-                        
-                        result = self.retry_on_failure(self.scrape_job, url)
-                        results.append(result)
-                        await Actor.push_data(result)
-                        progress["completed"] += 1
-                        
-                    except Exception as e:
-                        Actor.log.error(f"Failed to scrape {url}: {e}")
-                        progress["failed"] += 1
-                        results.append({"error": str(e), "url": url, "type": "job"})
-                    
-                    # Update progress
-                    await Actor.set_value("PROGRESS", progress)
-                    
-            elif scrape_type == "job_search":
-                job_results = self.search_jobs(job_search_term, scrape_recommended=True)
-                for i, result in enumerate(job_results[:max_results]):
-                    results.append(result)
-                    await Actor.push_data(result)
-                    progress["completed"] += 1
-                    
-                    if (i + 1) % 10 == 0:
-                        await Actor.set_value("PROGRESS", progress)
+            await self.flush_results()
             
             # Final progress update
             progress["status"] = "completed"
-            await Actor.set_value("PROGRESS", progress)
+            await self.save_progress(progress, force=True)
             
             # Save session state if using session pool
             if self.session_pool_name:
@@ -617,21 +1010,34 @@ class LinkedInScraperActor:
                 }
                 await Actor.set_value(f"SESSION_{self.session_pool_name}_FINAL", session_info)
             
-            Actor.log.info(f"Successfully scraped {len(results)} items ({progress['failed']} failed)")
+            Actor.log.info(f"Successfully scraped {progress['completed']} items ({progress['failed']} failed)")
+            if self.result_cache:
+                Actor.log.info(f"Result cache: {self.result_cache.hits} hits, {self.result_cache.misses} misses")
             
         except Exception as e:
+            tb = traceback.format_exc()
             Actor.log.error(f"Fatal error in actor run: {e}")
-            Actor.log.error(traceback.format_exc())
-            await Actor.set_value("ERROR", {"error": str(e), "traceback": traceback.format_exc()})
+            Actor.log.error(tb)
+            await Actor.set_value("ERROR", {"error": str(e), "traceback": tb})
             
         finally:
-            if self.driver:
-                try:
-                    self.driver.quit()
-                except:
-                    pass
+            # Don't lose buffered results and progress if the run failed midway
+            try:
+                await self.flush_results()
+                if self._progress and self._unsaved_progress:
+                    await self.save_progress(self._progress, force=True)
+            except Exception as e:
+                Actor.log.error(f"Failed to push buffered results: {e}")
+            await self.quit_driver(self.driver)
+            await asyncio.get_running_loop().run_in_executor(None, self.stop_service)
+            if self.http_session and self._owns_http_session:
+                await self.http_session.close()
+                self.http_session = None
+            if self._executor:
+                self._executor.shutdown(wait=False)
+                self._executor = None
         
-        return results
+        return self.summary()
 
 
 async def main():
@@ -640,12 +1046,16 @@ async def main():
         actor_input = await Actor.get_input() or {}
         
         Actor.log.info("LinkedIn Scraper Actor started")
-        Actor.log.info(f"Input: {json.dumps(actor_input, indent=2)}")
+        # Serializing a large input is wasted work when INFO logs are filtered out
+        if Actor.log.isEnabledFor(logging.INFO):
+            Actor.log.info("Input: %s", orjson.dumps(actor_input, option=orjson.OPT_INDENT_2).decode())
         
         scraper = LinkedInScraperActor()
-        results = await scraper.run(actor_input)
+        summary = await scraper.run(actor_input)
         
-        Actor.log.info(f"LinkedIn Scraper Actor finished. Scraped {len(results)} items")
+        Actor.log.info(
+            f"LinkedIn Scraper Actor finished. Scraped {summary['completed']} items ({summary['failed']} failed)"
+        )
 
 
 if __name__ == "__main__":
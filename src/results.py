@@ -0,0 +1,208 @@
+"""Conversion of scraped linkedin_scraper objects into dataset items.
+
+This module is kept free of I/O so it can be compiled with mypyc (see
+``make compile``). The compiled extension is picked up automatically
+when present; otherwise the plain Python module is used.
+
+The linkedin_scraper objects are typed as ``Any`` on purpose: their
+dataclasses declare ``str`` fields that hold ``None`` until scraped, and
+compiled code would reject those values at runtime.
+
+Results are kept as slotted dataclasses for the lifetime of a run and only
+turned into dicts by ``as_item`` when they are pushed or cached.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+# Person instance attributes copied into results, with their default when the scraper didn't set them.
+# company and job_title are properties, so they are read separately.
+PERSON_FIELDS: Dict[str, Any] = {
+    "name": None,
+    "location": None,
+    "about": None,
+    "open_to_work": False,
+}
+
+# Result key -> Company attribute
+COMPANY_FIELDS: Dict[str, str] = {
+    "name": "name",
+    "about": "about_us",
+    "website": "website",
+    "phone": "phone",
+    "headquarters": "headquarters",
+    "founded": "founded",
+    "industry": "industry",
+    "company_type": "company_type",
+    "company_size": "company_size",
+    "specialties": "specialties",
+    "headcount": "headcount",
+}
+
+# Fields only present in a dataset item when the matching option was requested
+OPTIONAL_FIELDS = frozenset(("contacts", "showcase_pages", "employees"))
+
+
+@dataclass(slots=True)
+class ExperienceResult:
+    position_title: Any = None
+    company: Any = None
+    location: Any = None
+    from_date: Any = None
+    to_date: Any = None
+    duration: Any = None
+    description: Any = None
+    linkedin_url: Any = None
+
+
+@dataclass(slots=True)
+class EducationResult:
+    institution: Any = None
+    degree: Any = None
+    from_date: Any = None
+    to_date: Any = None
+    description: Any = None
+    linkedin_url: Any = None
+
+
+@dataclass(slots=True)
+class PersonResult:
+    type: str = "person"
+    url: str = ""
+    name: Any = None
+    location: Any = None
+    about: Any = None
+    open_to_work: Any = False
+    company: Any = None
+    job_title: Any = None
+    experiences: List[ExperienceResult] = field(default_factory=list)
+    educations: List[EducationResult] = field(default_factory=list)
+    interests: List[Any] = field(default_factory=list)
+    accomplishments: List[Any] = field(default_factory=list)
+    scraped_at: Optional[str] = None
+    contacts: Optional[List[Dict[str, Any]]] = None
+
+
+@dataclass(slots=True)
+class CompanyResult:
+    type: str = "company"
+    url: str = ""
+    name: Any = None
+    about: Any = None
+    website: Any = None
+    phone: Any = None
+    headquarters: Any = None
+    founded: Any = None
+    industry: Any = None
+    company_type: Any = None
+    company_size: Any = None
+    specialties: Any = None
+    headcount: Any = None
+    scraped_at: Optional[str] = None
+    showcase_pages: Optional[List[Dict[str, Any]]] = None
+    employees: Optional[List[Any]] = None
+
+
+# Job results and error records are still plain dicts
+Result = Union[PersonResult, CompanyResult, Dict[str, Any]]
+
+
+def as_item(result: Result) -> Dict[str, Any]:
+    """Convert a result into the dict pushed to the dataset; plain dicts pass through."""
+    if isinstance(result, dict):
+        return result
+    return {
+        key: value for key, value in asdict(result).items()
+        if value is not None or key not in OPTIONAL_FIELDS
+    }
+
+
+def experience_result(exp: Any) -> ExperienceResult:
+    """Convert a linkedin_scraper Experience."""
+    return ExperienceResult(
+        position_title=exp.position_title,
+        company=exp.institution_name,
+        location=exp.location,
+        from_date=exp.from_date,
+        to_date=exp.to_date,
+        duration=exp.duration,
+        description=exp.description,
+        linkedin_url=exp.linkedin_url,
+    )
+
+
+def education_result(edu: Any) -> EducationResult:
+    """Convert a linkedin_scraper Education."""
+    return EducationResult(
+        institution=edu.institution_name,
+        degree=edu.degree,
+        from_date=edu.from_date,
+        to_date=edu.to_date,
+        description=edu.description,
+        linkedin_url=edu.linkedin_url,
+    )
+
+
+def person_result(person: Any, url: str, get_contacts: bool, scraped_at: str) -> PersonResult:
+    """Build the result for a scraped Person."""
+    attrs = vars(person)
+    result = PersonResult(
+        url=url,
+        company=person.company,
+        job_title=person.job_title,
+        experiences=[experience_result(exp) for exp in person.experiences],
+        educations=[education_result(edu) for edu in person.educations],
+        scraped_at=scraped_at,
+        **{key: attrs.get(key, default) for key, default in PERSON_FIELDS.items()},
+    )
+
+    # Add contacts if requested
+    if get_contacts and person.contacts:
+        result.contacts = [
+            {
+                "name": contact.name,
+                "occupation": contact.occupation,
+                "url": contact.url
+            }
+            for contact in person.contacts
+        ]
+
+    return result
+
+
+def company_result(company: Any, url: str, get_employees: bool, scraped_at: str) -> CompanyResult:
+    """Build the result for a scraped Company."""
+    result = CompanyResult(
+        url=url,
+        scraped_at=scraped_at,
+        **{key: getattr(company, attr) for key, attr in COMPANY_FIELDS.items()},
+    )
+
+    # Add showcase pages
+    if company.showcase_pages:
+        result.showcase_pages = [
+            {
+                "name": page.name,
+                "url": page.linkedin_url,
+                "followers": page.followers
+            }
+            for page in company.showcase_pages
+        ]
+
+    # Add employees if requested
+    if get_employees and company.employees:
+        result.employees = company.employees
+
+    return result
+
+
+def job_listing_result(job: Any, result_type: str, scraped_at: str) -> Dict[str, Any]:
+    """Build the listing entry for a Job found by a job search."""
+    return {
+        "type": result_type,
+        "job_title": job.job_title,
+        "company": job.company,
+        "location": job.location,
+        "url": job.linkedin_url,
+        "scraped_at": scraped_at
+    }
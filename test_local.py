@@ -5,19 +5,117 @@ Run this script to test the actor locally before deploying to Apify
 """
 
 import asyncio
+import bisect
+import collections
+import contextlib
+import hashlib
+import itertools
 import json
+import logging
 import os
+
+import aiohttp
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+class MockProxyConfig:
+    """Mock Apify proxy configuration handing out proxy URLs by weighted round-robin
+    
+    Each proxy gets new_url calls in proportion to its weight; a proxy with weight 0 is out of
+    the pool. Picking a URL is one bisect into the cumulative weights, and the weights are
+    updated in place, with the sums only rebuilt when a weight actually changes.
+    """
+    
+    def __init__(self, proxies=()):
+        self._proxies = [[url, weight] for url, weight in proxies]
+        self._cumulative = []
+        self._cursor = 0
+        self._rebuild()
+    
+    def _rebuild(self):
+        self._cumulative = list(itertools.accumulate(weight for _, weight in self._proxies))
+    
+    async def new_url(self, session_id=None):
+        """Mock proxy URL generation; None when the pool is empty"""
+        total = self._cumulative[-1] if self._cumulative else 0
+        if not total:
+            return None
+        index = bisect.bisect_right(self._cumulative, self._cursor % total)
+        self._cursor += 1
+        return self._proxies[index][0]
+    
+    def set_weight(self, url, weight):
+        """Change a proxy's weight in place, returning whether the pool changed"""
+        for proxy in self._proxies:
+            if proxy[0] == url and proxy[1] != weight:
+                proxy[1] = weight
+                self._rebuild()
+                return True
+        return False
+
+
+class MockKeyValueStore:
+    """In-memory stand-in for a named Apify key-value store"""
+    
+    def __init__(self):
+        self._values = {}
+    
+    async def get_value(self, key, default_value=None):
+        return self._values.get(key, default_value)
+    
+    async def set_value(self, key, value, content_type=None):
+        self._values[key] = value
+
+
 # Mock Apify Actor for local testing
-class MockActor:
-    @staticmethod
-    def log():
-        import logging
-        return logging.getLogger(__name__)
+class MockActor(contextlib.AbstractAsyncContextManager):
+    """Stands in for the apify Actor; used with async with, it also cleans up after a test.
+    
+    Drivers, chromedriver and the HTTP session are closed on exit even when the test fails
+    midway, so repeated runs don't leave Chrome processes behind.
+    """
+    log = logging.getLogger(__name__)
+    # HTTP session shared by every scraper of a test run, set by the test before it runs the scraper
+    http_session = None
+    # (url, weight) pairs served by the mock proxy configuration; empty means no proxy
+    proxy_pool = ()
+    # Named key-value stores, kept for the whole test process like the platform keeps them across runs
+    key_value_stores = {}
+    
+    def __init__(self):
+        self._scrapers = []
+        self._drivers = []
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self._close()
+    
+    def register(self, scraper):
+        """Track a scraper so its drivers and chromedriver are shut down on exit"""
+        self._scrapers.append(scraper)
+        return scraper
+    
+    async def setup_driver(self, scraper, headless=False):
+        """Start a driver on a registered scraper and track it for cleanup"""
+        driver = await scraper.setup_driver(headless=headless)
+        self._drivers.append((scraper, driver))
+        return driver
+    
+    async def _close(self):
+        """Quit tracked drivers, stop chromedriver and close the shared HTTP session"""
+        for scraper, driver in self._drivers:
+            await scraper.quit_driver(driver)
+        self._drivers.clear()
+        loop = asyncio.get_running_loop()
+        for scraper in self._scrapers:
+            await scraper.quit_driver(scraper.driver)
+            # Stopping chromedriver blocks, so keep it off the event loop
+            await loop.run_in_executor(None, scraper.stop_service)
+        self._scrapers.clear()
+        if MockActor.http_session:
+            await MockActor.http_session.close()
+            MockActor.http_session = None
     
     @staticmethod
     async def get_input():
@@ -42,7 +140,9 @@ class MockActor:
             "headless": False,  # Show browser for debugging
             "getContacts": False,
             "getEmployees": False,
-            "maxResults": 2
+            "maxResults": 2,
+            # URLs are scraped in parallel, one browser per slot
+            "concurrency": 4
         }
     
     @staticmethod
@@ -51,25 +151,58 @@ class MockActor:
         print(f"Data pushed: {json.dumps(data, indent=2)}")
     
     @staticmethod
-    async def set_value(key, value):
+    async def set_value(key, value, content_type=None):
         """Mock key-value store"""
         print(f"Key-Value stored: {key} = {json.dumps(value, indent=2)}")
     
+    @classmethod
+    async def open_key_value_store(cls, name=None):
+        """Mock named key-value store, e.g. the saved login session"""
+        return cls.key_value_stores.setdefault(name, MockKeyValueStore())
+    
     @staticmethod
-    def create_proxy_configuration(**kwargs):
+    async def create_proxy_configuration(**kwargs):
         """Mock proxy configuration"""
-        class MockProxyConfig:
-            async def new_url(self, session_id=None):
-                """Mock proxy URL generation"""
-                return None
-        
-        return MockProxyConfig() if kwargs.get("useApifyProxy") else None
+        return MockProxyConfig(MockActor.proxy_pool)
+    
+    @classmethod
+    def get_http_session(cls):
+        """Return the test run's shared HTTP session"""
+        return cls.http_session
+
+
+def create_test_session(cached=False, account=None):
+    """HTTP session kept open for the whole test run, so URLs after the first reuse warm connections
+    
+    With cached, responses are kept in a SQLite file for an hour so reruns don't hit LinkedIn
+    again (needs aiohttp-client-cache). Each account gets its own file, so a profile fetched
+    with one account's cookies is never replayed for another.
+    """
+    session_args = dict(
+        connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=75),
+        timeout=aiohttp.ClientTimeout(total=30),
+        # The scraper sends its LinkedIn cookies with each request; don't let responses accumulate others
+        cookie_jar=aiohttp.DummyCookieJar(),
+    )
+    if not cached:
+        return aiohttp.ClientSession(**session_args)
+    
+    from aiohttp_client_cache import CachedSession, SQLiteBackend
+    
+    account_key = hashlib.sha1((account or "").encode()).hexdigest()[:16]
+    cache = SQLiteBackend(f".test_cache_{account_key}", expire_after=3600)
+    print(f"Using response cache .test_cache_{account_key}.sqlite")
+    return CachedSession(cache=cache, **session_args)
 
 
-async def test_scraper():
-    """Test the LinkedIn scraper locally"""
+async def test_scraper(concurrency=None, cached=False, batch_size=4):
+    """Test the LinkedIn scraper locally
+    
+    The scraper fans the URLs out over its own driver pool (asyncio.gather bounded by a
+    semaphore), so the harness only sets how many run at once. With batch_size the scraper
+    runs the URLs in batches with a random pause in between, keeping its drivers logged in.
+    """
     import sys
-    import logging
     
     # Setup logging
     logging.basicConfig(
@@ -83,11 +216,11 @@ async def test_scraper():
     # Import after mocking
     from src.main import LinkedInScraperActor
     
-    # Create scraper instance
-    scraper = LinkedInScraperActor()
-    
     # Get test input
     test_input = await MockActor.get_input()
+    if concurrency:
+        test_input["concurrency"] = concurrency
+    test_input["batchSize"] = batch_size
     
     print("=" * 60)
     print("LinkedIn Scraper Actor - Local Test")
@@ -95,97 +228,208 @@ async def test_scraper():
     print(f"Test Input: {json.dumps(test_input, indent=2)}")
     print("=" * 60)
     
-    # Run the scraper
-    try:
-        results = await scraper.run(test_input)
+    async with MockActor() as actor:
+        account = test_input.get("email") or test_input.get("cookie")
+        MockActor.http_session = create_test_session(cached, account)
         
-        print("=" * 60)
-        print(f"Test completed successfully!")
-        print(f"Total results: {len(results)}")
-        print("=" * 60)
+        # Create scraper instance
+        scraper = actor.register(LinkedInScraperActor(http_session=MockActor.get_http_session()))
         
-        # Print results
-        for i, result in enumerate(results, 1):
-            print(f"\nResult {i}:")
-            print(json.dumps(result, indent=2))
+        # Run the scraper
+        try:
+            summary = await scraper.run(test_input)
             
-    except Exception as e:
-        print(f"Test failed with error: {e}")
-        import traceback
-        traceback.print_exc()
+            print("=" * 60)
+            print(f"Test completed successfully!")
+            print(f"Completed: {summary['completed']}, failed: {summary['failed']}")
+            print("Results are printed above as they were pushed")
+            print("=" * 60)
+                
+        except Exception as e:
+            print(f"Test failed with error: {e}")
+            import traceback
+            traceback.print_exc()
 
 
-def test_specific_function():
+async def test_specific_function():
     """Test specific functions of the scraper"""
     from src.main import LinkedInScraperActor
+    from src.results import as_item
     
-    scraper = LinkedInScraperActor()
+    # Every step runs on one event loop; the driver is shut down on exit, even if login or scraping raises
+    async with MockActor() as actor:
+        scraper = actor.register(LinkedInScraperActor())
+        
+        # Test driver setup
+        print("Testing driver setup...")
+        driver = await actor.setup_driver(scraper, headless=False)
+        
+        # Test login
+        print("Testing LinkedIn login...")
+        email = os.getenv("LINKEDIN_EMAIL")
+        password = os.getenv("LINKEDIN_PASSWORD")
+        
+        if await scraper.login_to_linkedin(driver, email, password):
+            print("Login successful!")
+            
+            # Test person scraping
+            test_url = "https://www.linkedin.com/in/example-profile"
+            print(f"Testing person scraping: {test_url}")
+            result = await scraper.scrape_person(driver, test_url)
+            print(f"Result: {json.dumps(as_item(result), indent=2)}")
+        else:
+            print("Login failed!")
+
+
+async def test_proxy_rotation():
+    """Test proxy rotation strategies"""
+    import sys
+    sys.modules['apify'] = type('module', (), {'Actor': MockActor})
     
-    # Test driver setup
-    print("Testing driver setup...")
-    driver = asyncio.run(scraper.setup_driver(headless=False))
+    from src.main import LinkedInScraperActor, Rotation
     
-    # Test login
-    print("Testing LinkedIn login...")
-    email = os.getenv("LINKEDIN_EMAIL")
-    password = os.getenv("LINKEDIN_PASSWORD")
+    print("=" * 60)
+    print("Testing Proxy Rotation Strategies")
+    print("=" * 60)
     
-    if scraper.login_to_linkedin(driver, email, password):
-        print("Login successful!")
+    async with MockActor() as actor:
+        # Test RECOMMENDED strategy
+        scraper = actor.register(LinkedInScraperActor())
+        scraper.proxy_rotation = Rotation.RECOMMENDED
+        scraper.session_pool_name = "test_pool"
+        scraper.proxy_config = await scraper.setup_proxy_configuration({"useApifyProxy": True})
         
-        # Test person scraping
-        test_url = "https://www.linkedin.com/in/example-profile"
-        print(f"Testing person scraping: {test_url}")
-        result = scraper.scrape_person(test_url)
-        print(f"Result: {json.dumps(result, indent=2)}")
-    else:
-        print("Login failed!")
-    
-    # Clean up
-    driver.quit()
+        print("\n1. Testing RECOMMENDED strategy:")
+        for i in range(3):
+            scraper.driver_starts = i
+            url = await scraper.get_proxy_url()
+            print(f"   Request {i}: {url or 'No proxy'}")
+        
+        # Test PER_REQUEST strategy
+        scraper.proxy_rotation = Rotation.PER_REQUEST
+        print("\n2. Testing PER_REQUEST strategy:")
+        for i in range(3):
+            scraper.driver_starts = i
+            url = await scraper.get_proxy_url()
+            print(f"   Request {i}: {url or 'New proxy each time'}")
+        
+        # Test UNTIL_FAILURE strategy
+        scraper.proxy_rotation = Rotation.UNTIL_FAILURE
+        scraper.current_proxy_url = None
+        print("\n3. Testing UNTIL_FAILURE strategy:")
+        for i in range(3):
+            url = await scraper.get_proxy_url()
+            print(f"   Request {i}: {url or 'Same proxy until failure'}")
+            if i == 1:
+                scraper.proxy_failure_count = 5  # Simulate failure
+                print("   Simulating proxy failure...")
+        
+    print("=" * 60)
 
 
-async def test_proxy_rotation():
-    """Test proxy rotation strategies"""
+async def test_proxy_weighted():
+    """Test weighted round-robin proxy selection, and dropping a proxy the actor rotated away from"""
     import sys
     sys.modules['apify'] = type('module', (), {'Actor': MockActor})
     
+    from selenium.common.exceptions import TimeoutException
+    from src.main import LinkedInScraperActor, Rotation
+    
+    print("=" * 60)
+    print("Testing Weighted Proxy Rotation")
+    print("=" * 60)
+    
+    MockActor.proxy_pool = (("http://proxy-a.example:8000", 3), ("http://proxy-b.example:8000", 1))
+    try:
+        async with MockActor() as actor:
+            scraper = actor.register(LinkedInScraperActor())
+            scraper.proxy_rotation = Rotation.PER_REQUEST
+            scraper.proxy_config = await scraper.setup_proxy_configuration({"useApifyProxy": True})
+            
+            print("\n1. Weighted round-robin (weights 3:1):")
+            counts = collections.Counter()
+            for i in range(8):
+                scraper.driver_starts = i
+                url = await scraper.get_proxy_url()
+                counts[url] += 1
+                print(f"   Request {i}: {url}")
+            print(f"   Share: {dict(counts)}")
+            
+            print("\n2. UNTIL_FAILURE drops a proxy once the actor rotates away from it:")
+            
+            class FailingDriver:
+                """Driver whose profile pages never load, like behind a flagged proxy"""
+                current_url = "https://www.linkedin.com/in/example-profile"
+                
+                def quit(self):
+                    pass
+            
+            async def failing_scrape(driver, url):
+                raise TimeoutException("Profile did not load")
+            
+            scraper.proxy_rotation = Rotation.UNTIL_FAILURE
+            scraper.max_retries = 1
+            scraper._driver_pool = asyncio.Queue()
+            scraper._driver_pool.put_nowait(FailingDriver())
+            scraper._driver_slots = 1
+            failing = await scraper.get_proxy_url()
+            removed_after = None
+            print(f"   Using {failing}")
+            for failure in range(1, scraper.max_proxy_failures + 1):
+                try:
+                    await scraper.scrape_with_driver(failing_scrape, "https://www.linkedin.com/in/example-profile", ())
+                except TimeoutException:
+                    pass
+                # The actor only forgets its proxy once failures reach max_proxy_failures;
+                # that is the one status change worth updating the pool for
+                if scraper.current_proxy_url is None and scraper.proxy_config.set_weight(failing, 0):
+                    removed_after = failure
+                    print(f"   proxy_status_changed: {failing} removed after {failure} failures")
+            
+            url = await scraper.get_proxy_url()
+            print(f"   Next proxy: {url}")
+            assert removed_after == scraper.max_proxy_failures and url != failing, "the actor should rotate away"
+    finally:
+        MockActor.proxy_pool = ()
+    
+    print("=" * 60)
+
+
+async def test_result_cache():
+    """Round-trip PROGRESS and cached results through a real local key-value store"""
+    import tempfile
+    
+    # Use the real SDK (not MockActor) on a throwaway storage directory
+    os.environ["CRAWLEE_STORAGE_DIR"] = tempfile.mkdtemp(prefix="linkedin-scraper-test-")
+    from apify import Actor
+    from src.cache import ResultCache
     from src.main import LinkedInScraperActor
+    from src.results import PersonResult, as_item
     
     print("=" * 60)
-    print("Testing Proxy Rotation Strategies")
+    print("Testing Result Cache and Progress Storage")
     print("=" * 60)
     
-    # Test RECOMMENDED strategy
-    scraper = LinkedInScraperActor()
-    scraper.proxy_rotation = "RECOMMENDED"
-    scraper.session_pool_name = "test_pool"
-    scraper.proxy_config = MockActor.create_proxy_configuration(useApifyProxy=True)
-    
-    print("\n1. Testing RECOMMENDED strategy:")
-    for i in range(3):
-        scraper.request_count = i
-        url = await scraper.get_proxy_url()
-        print(f"   Request {i}: {url or 'No proxy'}")
-    
-    # Test PER_REQUEST strategy
-    scraper.proxy_rotation = "PER_REQUEST"
-    print("\n2. Testing PER_REQUEST strategy:")
-    for i in range(3):
-        scraper.request_count = i
-        url = await scraper.get_proxy_url()
-        print(f"   Request {i}: {url or 'New proxy each time'}")
-    
-    # Test UNTIL_FAILURE strategy
-    scraper.proxy_rotation = "UNTIL_FAILURE"
-    scraper.current_proxy_url = None
-    print("\n3. Testing UNTIL_FAILURE strategy:")
-    for i in range(3):
-        url = await scraper.get_proxy_url()
-        print(f"   Request {i}: {url or 'Same proxy until failure'}")
-        if i == 1:
-            scraper.proxy_failure_count = 5  # Simulate failure
-            print("   Simulating proxy failure...")
+    async with Actor:
+        cache = ResultCache(max_age_ms=60_000, store_name="linkedin-scraper-cache-test")
+        await cache.open()
+        url = "https://www.linkedin.com/in/example-profile"
+        result = PersonResult(url=url, name="Example Person", scraped_at="2024-01-01T00:00:00+00:00")
+        
+        await cache.set("person", url, [False], result)
+        cached = await cache.get("person", url, [False])
+        assert cached == dict(as_item(result), from_cache=True), cached
+        print("   Cached result read back as a dict")
+        
+        assert await cache.get("person", url, [True]) is None, "other options must miss"
+        await cache.set("person", url + "-error", [False], {"error": "boom", "url": url})
+        assert await cache.get("person", url + "-error", [False]) is None, "errors must not be cached"
+        print("   Other options and error results miss")
+        
+        progress = {"total": 2, "completed": 1, "failed": 0, "scrape_type": "person"}
+        await LinkedInScraperActor().save_progress(progress, force=True)
+        assert await Actor.get_value("PROGRESS") == progress
+        print("   PROGRESS read back as a dict")
     
     print("=" * 60)
 
@@ -196,19 +440,42 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Test LinkedIn Scraper Actor locally")
     parser.add_argument(
         "--mode",
-        choices=["full", "function", "proxy"],
+        choices=["full", "function", "proxy", "proxy_weighted", "cache"],
         default="full",
-        help="Test mode: full actor run, specific function test, or proxy rotation test"
+        help="Test mode: full actor run, specific function test, proxy rotation test, weighted proxy test "
+             "or result cache test"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="URLs scraped in parallel in full mode (default: the test input's concurrency)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=4,
+        help="URLs per batch in full mode, with a random pause between batches"
+    )
+    parser.add_argument(
+        "--cached",
+        action="store_true",
+        help="Cache HTTP responses on disk in full mode, so reruns skip the network (needs aiohttp-client-cache)"
     )
     
     args = parser.parse_args()
     
     if args.mode == "full":
         # Run full actor test
-        asyncio.run(test_scraper())
+        asyncio.run(test_scraper(args.concurrency, args.cached, args.batch_size))
     elif args.mode == "proxy":
         # Test proxy rotation strategies
         asyncio.run(test_proxy_rotation())
+    elif args.mode == "proxy_weighted":
+        # Test weighted proxy selection
+        asyncio.run(test_proxy_weighted())
+    elif args.mode == "cache":
+        # Test result cache and progress storage
+        asyncio.run(test_result_cache())
     else:
         # Test specific functions
-        test_specific_function()
+        asyncio.run(test_specific_function())